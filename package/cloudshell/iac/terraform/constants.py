@@ -1,13 +1,25 @@
+import os
+import sys
+
 # Terraform URLs
 TERRAFORM_URL = "https://releases.hashicorp.com/terraform"
 TERRAFORM_LATEST_URL = "https://checkpoint-api.hashicorp.com/v1/check/terraform"
 
+# Downloaded terraform executables are cached here per version and OS type
+TERRAFORM_EXEC_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cloudshell", "tf-cache")
+# With TerraformShellConfig.use_plugin_cache_dir, providers downloaded by 'terraform init' are shared between
+# working dirs through this plugin cache dir
+TF_PLUGIN_CACHE_DIR_ENV_VAR = "TF_PLUGIN_CACHE_DIR"
+TERRAFORM_PLUGIN_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".terraform.d", "plugin-cache")
+
 # OS types defined by sys.platform
 OS_TYPES = {
     'darwin': 'darwin_amd64',
     'linux': 'linux_amd64',
     'win32': 'windows_amd64'
 }
+# OS type of the current platform, None if the platform isn't supported
+CURRENT_OS_ARCH = OS_TYPES.get(sys.platform)
 
 # Log levels
 ERROR_LOG_LEVEL = 40
@@ -30,10 +42,16 @@ PLAN = "PLAN"
 APPLY = "APPLY"
 OUTPUT = "OUTPUT"
 DESTROY = "DESTROY"
-ALLOWED_LOGGING_CMDS = [INIT, PLAN, APPLY, DESTROY]
+ALLOWED_LOGGING_CMDS = frozenset({INIT, PLAN, APPLY, DESTROY})
+
+# Working dir files
+TF_INIT_HASH_FILE = ".tfinit-hash"
+# files that 'terraform init' depends on besides the backend config vars
+TF_INIT_INPUT_FILES = ("backend.tf", ".terraform.lock.hcl")
 
 # Sandbox data keys
 TF_WORKING_DIR = "TF_WORKING_DIR"
+TF_TEMP_ROOT = "TF_TEMP_ROOT"
 
 # CLP models
 AZURE1G_MODEL = "Microsoft Azure"
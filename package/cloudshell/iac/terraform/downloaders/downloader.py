@@ -7,6 +7,7 @@ from cloudshell.iac.terraform.models.shell_helper import ShellHelperObject
 class Downloader(object):
     def __init__(self, shell_helper: ShellHelperObject):
         self._shell_helper = shell_helper
+        self.tf_temp_root = None
 
     def download_terraform_module(self) -> str:
         url = self._shell_helper.attr_handler.get_attribute(ATTRIBUTE_NAMES.GITHUB_TERRAFORM_MODULE_URL)
@@ -18,7 +19,9 @@ class Downloader(object):
         self._shell_helper.logger.info("Downloading Terraform Repo from Github")
 
         downloader = GitHubScriptDownloader(self._shell_helper.logger)
-        return downloader.download_repo(url, token, branch)
+        tf_working_dir = downloader.download_repo(url, token, branch)
+        self.tf_temp_root = downloader.repo_temp_dir
+        return tf_working_dir
 
     def download_terraform_executable(self, tf_workingdir: str) -> None:
         try:
@@ -22,6 +22,7 @@ class GitHubScriptDownloader(object):
 
     def __init__(self, logger: Logger):
         self.logger = logger
+        self.repo_temp_dir = None
 
     @retry((HTTPError, URLError), delay=1, backoff=2, tries=5)
     def download_repo(self, url: str, token: str, branch: str = "") -> str:
@@ -54,6 +55,7 @@ class GitHubScriptDownloader(object):
         if not isinstance(tf_response_json, list):
             path_in_repo = os.sep.join(url_data.path.split("/")[:-1])
         repo_temp_dir = tempfile.mkdtemp()
+        self.repo_temp_dir = repo_temp_dir
         self.logger.info(f"Temp repo dir = {repo_temp_dir}")
         repo_zip_path = os.path.join(repo_temp_dir, REPO_FILE_NAME)
         with open(os.path.join(repo_temp_dir, REPO_FILE_NAME), 'wb+') as file:
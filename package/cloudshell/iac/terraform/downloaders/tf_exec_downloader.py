@@ -1,8 +1,9 @@
 import json
 import os
 import re
-import sys
+import shutil
 import ssl
+import tempfile
 from io import BytesIO
 from logging import Logger
 from urllib.request import Request, urlopen
@@ -11,7 +12,8 @@ from zipfile import ZipFile
 from retry import retry
 from urllib.error import HTTPError, URLError
 
-from cloudshell.iac.terraform.constants import TERRAFORM_LATEST_URL, OS_TYPES, TERRAFORM_URL
+from cloudshell.iac.terraform.constants import TERRAFORM_LATEST_URL, CURRENT_OS_ARCH, TERRAFORM_URL, \
+    TERRAFORM_EXEC_CACHE_DIR
 
 
 class TfExecDownloader(object):
@@ -45,17 +47,42 @@ class TfExecDownloader(object):
             raise ValueError(f'Target path: {tf_workingdir} does not exist. Cannot be sym link.')
         if valid_version_regex.match(version) is None:
             raise ValueError(f'Version {version} is not a valid format. examples 1.0.0, 0.15.2, 0.12.15')
-        if sys.platform not in OS_TYPES:
+        if CURRENT_OS_ARCH is None:
             raise ValueError('Could not find OS type. Must be 64 bit and Windows, Ubuntu, or CentOS/Redhat.')
 
-        os_type = OS_TYPES[sys.platform]
-        # Downloads and unzips files in memory, then outputs exe to path
-        zipurl = f'{TERRAFORM_URL}/{version}/terraform_{version}_{os_type}.zip'
-        with urlopen(zipurl) as zipresp:
-            with ZipFile(BytesIO(zipresp.read())) as zfile:
-                zfile.extractall(tf_workingdir)
-
-        # Linux systems do not add .exe but windows does, adding .exe so commands will be the same on all OS's
-        if os.path.exists(f'{tf_workingdir}/terraform'):
-            os.rename(f'{tf_workingdir}/terraform', f'{tf_workingdir}/terraform.exe')
-        os.chmod(f'{tf_workingdir}/terraform.exe', 0o755)
+        cached_tf_exe = TfExecDownloader._get_cached_terraform_executable(version)
+        # copy2 keeps the executable permissions of the cached file
+        shutil.copy2(cached_tf_exe, os.path.join(tf_workingdir, 'terraform.exe'))
+
+    @staticmethod
+    def _get_cached_terraform_executable(version: str) -> str:
+        cache_dir = os.path.join(TERRAFORM_EXEC_CACHE_DIR, version, CURRENT_OS_ARCH)
+        cached_tf_exe = os.path.join(cache_dir, 'terraform.exe')
+        if os.path.exists(cached_tf_exe):
+            return cached_tf_exe
+
+        os.makedirs(cache_dir, exist_ok=True)
+        download_dir = tempfile.mkdtemp(dir=cache_dir)
+        try:
+            # Downloads and unzips files in memory, then outputs exe to path
+            zipurl = f'{TERRAFORM_URL}/{version}/terraform_{version}_{CURRENT_OS_ARCH}.zip'
+            with urlopen(zipurl) as zipresp:
+                with ZipFile(BytesIO(zipresp.read())) as zfile:
+                    zfile.extractall(download_dir)
+
+            # Linux systems do not add .exe but windows does, adding .exe so commands will be the same on all OS's
+            if os.path.exists(f'{download_dir}/terraform'):
+                os.rename(f'{download_dir}/terraform', f'{download_dir}/terraform.exe')
+            os.chmod(f'{download_dir}/terraform.exe', 0o755)
+            # runs that start together may all miss the cache and download the same version - replace is atomic so
+            # the cached file is never partial, and the last one to finish wins
+            try:
+                os.replace(f'{download_dir}/terraform.exe', cached_tf_exe)
+            except OSError:
+                # on Windows replacing fails while another run is still copying the cached file -
+                # that file is complete so use it and drop our own copy
+                if not os.path.exists(cached_tf_exe):
+                    raise
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
+        return cached_tf_exe
@@ -31,17 +31,48 @@ def handle_remove_readonly(func, path, exc_info):
 class LocalDir:
     @staticmethod
     def delete_local_temp_dir(sandbox_data_handler: SandboxDataHandler, tf_working_dir: str):
-        tf_path = Path(tf_working_dir)
-        tmp_folder_found = False
-        while not tmp_folder_found:
-            objects_in_folder = os.listdir(tf_path.parent.absolute())
-            if len(objects_in_folder) == 2:
-                if 'REPO' in objects_in_folder and 'repo.zip' in objects_in_folder:
-                    tmp_folder_found = True
-            tf_path = Path(tf_path.parent.absolute())
-        tf_path_str = str(tf_path)
-        shutil.rmtree(tf_path_str, onerror=handle_remove_readonly)
-        sandbox_data_handler.set_tf_working_dir("")
+        # read the sandbox data once and reuse it when clearing the working dir
+        uuid_data = sandbox_data_handler.get_uuid_data()
+        tf_temp_root = sandbox_data_handler.get_tf_temp_root(uuid_data)
+        if not LocalDir._is_inside_dir(tf_working_dir, tf_temp_root):
+            # the temp root wasn't recorded (working dir prepared by an older version) or it belongs to
+            # another working dir - look it up
+            tf_temp_root = LocalDir._find_repo_temp_dir(tf_working_dir)
+        shutil.rmtree(tf_temp_root, onerror=handle_remove_readonly)
+        sandbox_data_handler.set_tf_working_dir("", tf_temp_root="", uuid_data=uuid_data)
+
+    @staticmethod
+    def _is_inside_dir(path: str, parent_dir: str) -> bool:
+        if not parent_dir:
+            return False
+        path = os.path.abspath(path)
+        parent_dir = os.path.abspath(parent_dir)
+        try:
+            return os.path.commonpath([path, parent_dir]) == parent_dir
+        except ValueError:
+            # paths on different drives
+            return False
+
+    @staticmethod
+    def _find_repo_temp_dir(tf_working_dir: str) -> str:
+        tf_path = Path(tf_working_dir).absolute()
+        while tf_path.parent != tf_path:
+            tf_path = tf_path.parent
+            if LocalDir._is_repo_temp_dir(tf_path):
+                return str(tf_path)
+        raise ValueError(f"Could not find the repo temp dir of working dir {tf_working_dir}")
+
+    @staticmethod
+    def _is_repo_temp_dir(path: Path) -> bool:
+        # the temp dir created by the downloader holds exactly the 'REPO' folder and 'repo.zip',
+        # stop scanning as soon as a third entry shows up
+        objects_in_folder = set()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                objects_in_folder.add(entry.name)
+                if len(objects_in_folder) > 2:
+                    return False
+        return objects_in_folder == {'REPO', 'repo.zip'}
 
     @staticmethod
     def does_working_dir_exists(dir: str) -> bool:
@@ -58,7 +89,7 @@ class LocalDir:
             tf_working_dir = downloader.download_terraform_module()
 
             downloader.download_terraform_executable(tf_working_dir)
-            sandbox_data_handler.set_tf_working_dir(tf_working_dir)
+            sandbox_data_handler.set_tf_working_dir(tf_working_dir, tf_temp_root=downloader.tf_temp_root)
         else:
             logger.info(f"Using existing working dir = {tf_working_dir}")
         return tf_working_dir
@@ -25,7 +25,8 @@ class ObjectFactory:
                                 tf_working_dir: str) -> TfProcExec:
         backend_handler = BackendHandler(shell_helper, tf_working_dir, sandbox_data_handler.get_tf_uuid())
         input_output_service = InputOutputService(shell_helper, config.inputs_map, config.outputs_map)
-        tf_proc_executer = TfProcExec(shell_helper, sandbox_data_handler, backend_handler, input_output_service)
+        tf_proc_executer = TfProcExec(shell_helper, sandbox_data_handler, backend_handler, input_output_service,
+                                      config.use_plugin_cache_dir)
         return tf_proc_executer
 
     @staticmethod
@@ -2,7 +2,8 @@ import json
 
 from cloudshell.api.cloudshell_api import SandboxDataKeyValue, GetSandboxDataInfo
 
-from cloudshell.iac.terraform.constants import EXECUTE_STATUS, DESTROY_STATUS, NONE, TF_WORKING_DIR, ATTRIBUTE_NAMES
+from cloudshell.iac.terraform.constants import EXECUTE_STATUS, DESTROY_STATUS, NONE, TF_WORKING_DIR, TF_TEMP_ROOT, \
+    ATTRIBUTE_NAMES
 from cloudshell.iac.terraform.models.shell_helper import ShellHelperObject
 
 
@@ -54,15 +55,34 @@ class SandboxDataHandler(object):
     def get_status(self, status_type: str) -> str:
         return self._get_value_for_key(status_type)
 
-    def set_tf_working_dir(self, tf_working_dir: str) -> None:
-        self._set_value_for_key(TF_WORKING_DIR, tf_working_dir)
+    def set_tf_working_dir(self, tf_working_dir: str, tf_temp_root: str = "", uuid_data: dict = None) -> None:
+        """
+        Set the working dir and the temp root it was downloaded to with a single sandbox data update.
+        The temp root is always overwritten so a root recorded for a previous working dir is never kept.
+        uuid_data can be passed to reuse sandbox data that was already read with get_uuid_data.
+        """
+        new_values = {TF_WORKING_DIR: tf_working_dir, TF_TEMP_ROOT: tf_temp_root}
+        self._set_values_for_keys(new_values, uuid_data)
 
     def get_tf_working_dir(self) -> str:
         return self._get_value_for_key(TF_WORKING_DIR)
 
+    def get_tf_temp_root(self, uuid_data: dict = None) -> str:
+        if uuid_data is None:
+            uuid_data = self.get_uuid_data()
+        # sandbox data entries created by older versions don't have this key
+        return uuid_data.get(TF_TEMP_ROOT, "")
+
+    def get_uuid_data(self) -> dict:
+        return self._check_for_uuid_data()
+
     def _set_value_for_key(self, key: str, new_value: str = ""):
-        uuid_sdkv_value = self._check_for_uuid_data()
-        uuid_sdkv_value[key] = new_value
+        self._set_values_for_keys({key: new_value})
+
+    def _set_values_for_keys(self, new_values: dict, uuid_sdkv_value: dict = None):
+        if uuid_sdkv_value is None:
+            uuid_sdkv_value = self._check_for_uuid_data()
+        uuid_sdkv_value.update(new_values)
         updated_sdkv = SandboxDataKeyValue(self._uuid, json.dumps(uuid_sdkv_value))
         self._driver_helper_obj.api.SetSandboxData(self._driver_helper_obj.sandbox_id, [updated_sdkv])
 
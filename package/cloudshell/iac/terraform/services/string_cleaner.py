@@ -2,11 +2,15 @@ import re
 
 from cloudshell.iac.terraform.constants import DIRTY_CHARS
 
+ANSI_ESCAPE_REGEX = re.compile(DIRTY_CHARS, re.VERBOSE)
+
 
 class StringCleaner(object):
 
     @staticmethod
     def get_clean_string(dirty_str: str) -> str:
-        ansi_escape = re.compile(DIRTY_CHARS, re.VERBOSE)
-        clean_str = ansi_escape.sub('', dirty_str).encode('cp1252', errors='replace').decode('cp1252').replace("?", "")
+        # every ANSI escape sequence starts with ESC, most Terraform output lines (-no-color) have none
+        if '\x1b' in dirty_str:
+            dirty_str = ANSI_ESCAPE_REGEX.sub('', dirty_str)
+        clean_str = dirty_str.encode('cp1252', errors='replace').decode('cp1252').replace("?", "")
         return clean_str
@@ -1,14 +1,23 @@
+import hashlib
 import json
+import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from distutils.util import strtobool
-from subprocess import check_output, STDOUT, CalledProcessError
+from io import StringIO
+from subprocess import Popen, PIPE, STDOUT
+from typing import Optional, Union
+
+import orjson
 from cloudshell.logging.qs_logger import _create_logger
 
 from cloudshell.iac.terraform.constants import ERROR_LOG_LEVEL, INFO_LOG_LEVEL, EXECUTE_STATUS, APPLY_PASSED, \
     PLAN_FAILED, INIT_FAILED, \
     DESTROY_STATUS, DESTROY_FAILED, APPLY_FAILED, DESTROY_PASSED, INIT, DESTROY, PLAN, OUTPUT, APPLY, \
-    ALLOWED_LOGGING_CMDS, ATTRIBUTE_NAMES
+    ALLOWED_LOGGING_CMDS, ATTRIBUTE_NAMES, TF_PLUGIN_CACHE_DIR_ENV_VAR, TERRAFORM_PLUGIN_CACHE_DIR, \
+    TF_INIT_HASH_FILE, TF_INIT_INPUT_FILES
 from cloudshell.iac.terraform.models.shell_helper import ShellHelperObject
 from cloudshell.iac.terraform.models.exceptions import TerraformExecutionError
 from cloudshell.iac.terraform.services.backend_handler import BackendHandler
@@ -17,27 +26,72 @@ from cloudshell.iac.terraform.services.sandox_data import SandboxDataHandler
 from cloudshell.iac.terraform.services.string_cleaner import StringCleaner
 from cloudshell.iac.terraform.tagging.tag_terraform_resources import start_tagging_terraform_resources
 
+# execute statuses after which there may be deployed resources to destroy
+_DESTROYABLE_EXECUTE_STATUSES = frozenset({APPLY_PASSED, APPLY_FAILED})
+
+# integer literals with 19+ digits may not fit in 64 bits (negatives below -2**63 have 19) -
+# orjson parses those as (lossy) floats
+_LONG_NUMBER_REGEX = re.compile(rb"\d{19,}")
+
+# START/END banners written around the output of each command in the exec log
+_EXEC_LOG_BANNERS = {
+    command: (
+        f"-------------------------------------------------=< {command} START "
+        f">=-------------------------------------------------\n",
+        f"-------------------------------------------------=< {command} END "
+        f">=---------------------------------------------------\n"
+    )
+    for command in ALLOWED_LOGGING_CMDS
+}
+
 
 class TfProcExec(object):
     def __init__(self, shell_helper: ShellHelperObject, sb_data_handler: SandboxDataHandler,
-                 backend_handler: BackendHandler, input_output_service: InputOutputService):
+                 backend_handler: BackendHandler, input_output_service: InputOutputService,
+                 use_plugin_cache_dir: bool = False):
         self._shell_helper = shell_helper
         self._sb_data_handler = sb_data_handler
         self._backend_handler = backend_handler
         self._input_output_service = input_output_service
         self._tf_working_dir = sb_data_handler.get_tf_working_dir()
-
-        dt = datetime.now().strftime("%d_%m_%y-%H_%M_%S")
-        self._exec_output_log = _create_logger(
-            log_group=shell_helper.sandbox_id, log_category="QS", log_file_prefix=f"TF_EXEC_LOG_{dt}"
-        )
+        self._tf_exe = os.path.join(self._tf_working_dir, 'terraform.exe')
+        self._cached_tf_vars = None
+        self._cached_tf_var_args = None
+        self._cached_exec_output_log = None
+        # the plugin cache dir isn't safe for concurrent 'terraform init' runs so it is only used when enabled
+        self._use_plugin_cache_dir = use_plugin_cache_dir and TF_PLUGIN_CACHE_DIR_ENV_VAR not in os.environ
+        if self._use_plugin_cache_dir:
+            os.makedirs(TERRAFORM_PLUGIN_CACHE_DIR, exist_ok=True)
+
+    @property
+    def _exec_output_log(self) -> logging.Logger:
+        # the log file is only created once there is Terraform output to write to it
+        if self._cached_exec_output_log is None:
+            dt = datetime.now().strftime("%d_%m_%y-%H_%M_%S")
+            self._cached_exec_output_log = _create_logger(
+                log_group=self._shell_helper.sandbox_id, log_category="QS", log_file_prefix=f"TF_EXEC_LOG_{dt}"
+            )
+        return self._cached_exec_output_log
 
     def init_terraform(self):
         self._shell_helper.logger.info("Performing Terraform Init...")
         self._shell_helper.sandbox_messages.write_message("running Terraform Init...")
 
-        self._backend_handler.generate_backend_cfg_file()
-        backend_config_vars = self._backend_handler.get_backend_secret_vars()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # TF variables aren't used by init but are read through the CloudShell API, read them while the backend
+            # is being prepared. Errors aren't raised here - the cache stays empty and tag/plan/destroy read them
+            # again and fail as before
+            tf_vars_future = executor.submit(self._get_all_tf_vars)
+            backend_config_vars = self._init_backend_config()
+        if tf_vars_future.exception():
+            self._shell_helper.logger.warning(
+                f"Failed reading Terraform variables during Terraform Init -> {str(tf_vars_future.exception())}"
+            )
+
+        if self._is_init_up_to_date(backend_config_vars):
+            self._shell_helper.logger.info("Terraform Init inputs didn't change, skipping Terraform Init")
+            self._set_service_status("Progress 20", "Init Passed")
+            return
 
         vars = ["init", "-no-color"]
         if backend_config_vars:
@@ -46,6 +100,8 @@ class TfProcExec(object):
         try:
             self._set_service_status("Progress 10", "Executing Terraform Init...")
             self._run_tf_proc_with_command(vars, INIT)
+            # init may have created/updated the lock file so the hash is computed after it
+            self._save_init_hash(backend_config_vars)
             self._set_service_status("Progress 20", "Init Passed")
         except Exception as e:
             self._set_service_status("Offline", "Init Failed")
@@ -56,14 +112,8 @@ class TfProcExec(object):
     def destroy_terraform(self):
         self._shell_helper.logger.info("Performing Terraform Destroy")
         self._shell_helper.sandbox_messages.write_message("running Terraform Destroy...")
-        cmd = ["destroy", "-auto-approve", "-no-color"]
-
-        tf_vars = self._input_output_service.get_all_terrafrom_variables()
-
         # add all TF variables to command
-        for tf_var in tf_vars:
-            cmd.append("-var")
-            cmd.append(f"{tf_var.name}={tf_var.value}")
+        cmd = ["destroy", "-auto-approve", "-no-color"] + self._get_tf_var_args()
 
         try:
             self._set_service_status("Progress 50", "Executing Terraform Destroy...")
@@ -91,14 +141,6 @@ class TfProcExec(object):
             self._shell_helper.logger.info("Adding Tags to Terraform Resources")
             self._shell_helper.sandbox_messages.write_message("generating tags...")
 
-            tf_vars = self._input_output_service.get_all_terrafrom_variables()
-
-            inputs_dict = dict()
-
-            # add all TF variables to command
-            for tf_var in tf_vars:
-                inputs_dict[tf_var.name] = tf_var.value
-
             default_tags_dict: dict = self._shell_helper.default_tags.get_default_tags()
 
             check_tag_input = self._shell_helper.attr_handler.get_attribute(ATTRIBUTE_NAMES.CT_INPUTS)
@@ -112,6 +154,12 @@ class TfProcExec(object):
             if len(tags_dict) > 50:
                 raise ValueError("AWS and Azure have a limit of 50 tags per resource, you have " + str(len(tags_dict)))
 
+            inputs_dict = dict()
+
+            # add all TF variables to the inputs used by the tagging terraform plan
+            for tf_var in self._get_all_tf_vars():
+                inputs_dict[tf_var.name] = tf_var.value
+
             self._shell_helper.logger.info(self._tf_working_dir)
             self._shell_helper.logger.info(tags_dict)
 
@@ -129,14 +177,8 @@ class TfProcExec(object):
         self._shell_helper.logger.info("Running Terraform Plan")
         self._shell_helper.sandbox_messages.write_message("generating Terraform Plan...")
 
-        cmd = ["plan", "-out", "planfile", "-input=false", "-no-color"]
-
-        tf_vars = self._input_output_service.get_all_terrafrom_variables()
-
         # add all TF variables to command
-        for tf_var in tf_vars:
-            cmd.append("-var")
-            cmd.append(f"{tf_var.name}={tf_var.value}")
+        cmd = ["plan", "-out", "planfile", "-input=false", "-no-color"] + self._get_tf_var_args()
 
         try:
             self._set_service_status("Progress 50", "Executing Terraform Plan...")
@@ -171,8 +213,8 @@ class TfProcExec(object):
 
             # get all TF outputs in json format
             cmd = ["output", "-json"]
-            tf_exec_output = self._run_tf_proc_with_command(cmd, OUTPUT, write_to_log=False)
-            unparsed_output_json = json.loads(tf_exec_output)
+            tf_exec_output = self._run_tf_proc_with_command(cmd, OUTPUT, write_to_log=False, decode=False)
+            unparsed_output_json = self._parse_output_json(tf_exec_output)
 
             self._input_output_service.parse_and_save_outputs(unparsed_output_json)
 
@@ -180,59 +222,132 @@ class TfProcExec(object):
             self._shell_helper.logger.error(f"Error occurred while trying to parse Terraform outputs -> {str(e)}")
             raise
 
+    @staticmethod
+    def _parse_output_json(tf_exec_output: bytes) -> dict:
+        # Terraform numbers have arbitrary precision: orjson turns integers beyond 64 bits into floats and fails on
+        # numbers out of double range, so fall back to the stdlib parser which keeps them as before
+        if _LONG_NUMBER_REGEX.search(tf_exec_output):
+            return json.loads(tf_exec_output)
+        try:
+            return orjson.loads(tf_exec_output)
+        except orjson.JSONDecodeError:
+            return json.loads(tf_exec_output)
+
     def can_execute_run(self) -> bool:
         execute_status = self._sb_data_handler.get_status(EXECUTE_STATUS)
         destroy_status = self._sb_data_handler.get_status(DESTROY_STATUS)
-        if destroy_status in [DESTROY_FAILED] and execute_status == APPLY_PASSED:
+        if destroy_status == DESTROY_FAILED and execute_status == APPLY_PASSED:
             return False
         return True
 
     def can_destroy_run(self) -> bool:
         execute_status = self._sb_data_handler.get_status(EXECUTE_STATUS)
-        if execute_status not in [APPLY_PASSED, APPLY_FAILED]:
+        if execute_status not in _DESTROYABLE_EXECUTE_STATUSES:
             return False
         return True
 
-    def _run_tf_proc_with_command(self, cmd: list, command: str, write_to_log: bool = True) -> str:
-        tform_command = [f"{os.path.join(self._tf_working_dir, 'terraform.exe')}"]
-        tform_command.extend(cmd)
+    def _init_backend_config(self) -> dict:
+        self._backend_handler.generate_backend_cfg_file()
+        return self._backend_handler.get_backend_secret_vars()
+
+    def _is_init_up_to_date(self, backend_config_vars: dict) -> bool:
+        # the init hash is only used to skip init - if it can't be read just run init
+        try:
+            return self._get_init_hash(backend_config_vars) == self._read_init_hash()
+        except OSError as e:
+            self._shell_helper.logger.warning(f"Failed reading Terraform Init hash, running Terraform Init -> {str(e)}")
+            return False
+
+    def _save_init_hash(self, backend_config_vars: dict) -> None:
+        try:
+            self._write_init_hash(self._get_init_hash(backend_config_vars))
+        except OSError as e:
+            self._shell_helper.logger.warning(f"Failed saving Terraform Init hash -> {str(e)}")
+
+    def _get_init_hash(self, backend_config_vars: dict) -> str:
+        init_hash = hashlib.sha256(orjson.dumps(backend_config_vars or {}, option=orjson.OPT_SORT_KEYS))
+        for file_name in TF_INIT_INPUT_FILES:
+            file_path = os.path.join(self._tf_working_dir, file_name)
+            if os.path.isfile(file_path):
+                init_hash.update(file_name.encode('utf-8'))
+                with open(file_path, 'rb') as init_input_file:
+                    init_hash.update(init_input_file.read())
+        return init_hash.hexdigest()
+
+    def _read_init_hash(self) -> Optional[str]:
+        # without the .terraform dir there is nothing initialized to reuse
+        init_hash_path = os.path.join(self._tf_working_dir, TF_INIT_HASH_FILE)
+        if not os.path.isdir(os.path.join(self._tf_working_dir, ".terraform")) or not os.path.isfile(init_hash_path):
+            return None
+        with open(init_hash_path, 'r') as init_hash_file:
+            return init_hash_file.read().strip()
+
+    def _write_init_hash(self, init_hash: str) -> None:
+        with open(os.path.join(self._tf_working_dir, TF_INIT_HASH_FILE), 'w') as init_hash_file:
+            init_hash_file.write(init_hash)
+
+    def _get_all_tf_vars(self) -> list:
+        # TF variables are read from service attributes (CloudShell API calls) and don't change during a run
+        if self._cached_tf_vars is None:
+            self._cached_tf_vars = self._input_output_service.get_all_terrafrom_variables()
+        return self._cached_tf_vars
+
+    def _get_tf_var_args(self) -> list:
+        if self._cached_tf_var_args is None:
+            self._cached_tf_var_args = []
+            for tf_var in self._get_all_tf_vars():
+                self._cached_tf_var_args.extend(["-var", f"{tf_var.name}={tf_var.value}"])
+        return self._cached_tf_var_args
+
+    def _run_tf_proc_with_command(self, cmd: list, command: str, write_to_log: bool = True,
+                                  decode: bool = True) -> Union[str, bytes]:
+        tform_command = [self._tf_exe, *cmd]
+
+        # with decode=False the raw output bytes are handed back as is (e.g. 'terraform output -json' which is
+        # parsed directly from bytes), otherwise the output is decoded and cleaned line by line as it is produced
+        raw_output = b""
+        clean_output = StringIO()
 
         try:
-            output = check_output(tform_command, cwd=self._tf_working_dir, stderr=STDOUT).decode('utf-8')
+            with Popen(tform_command, cwd=self._tf_working_dir, stdout=PIPE, stderr=STDOUT,
+                       env=self._get_tf_proc_env()) as proc:
+                if decode:
+                    for line in proc.stdout:
+                        clean_output.write(StringCleaner.get_clean_string(line.decode('utf-8')))
+                else:
+                    raw_output = proc.stdout.read()
+                return_code = proc.wait()
+        except Exception as e:
+            clean_error = StringCleaner.get_clean_string(str(e))
+            self._shell_helper.logger.error(f"Error Running Terraform {command} {clean_error}")
+            raise TerraformExecutionError("Error during Terraform Plan. For more information please look at the logs.")
 
-            clean_output = StringCleaner.get_clean_string(output)
-            if write_to_log:
-                self._write_to_exec_log(command, clean_output, INFO_LOG_LEVEL)
-            return output
+        if not decode and (return_code or write_to_log):
+            clean_output.write(StringCleaner.get_clean_string(raw_output.decode('utf-8')))
 
-        except CalledProcessError as e:
-            clean_output = StringCleaner.get_clean_string(e.output.decode('utf-8'))
+        if return_code:
             self._shell_helper.logger.error(
-                f"Error occurred while trying to execute Terraform | Output = {clean_output}"
+                f"Error occurred while trying to execute Terraform | Output = {clean_output.getvalue()}"
             )
             if command in ALLOWED_LOGGING_CMDS:
-                self._write_to_exec_log(command, clean_output, ERROR_LOG_LEVEL)
+                self._write_to_exec_log(command, clean_output.getvalue(), ERROR_LOG_LEVEL)
             raise TerraformExecutionError(f"Error during Terraform {command}. "
                                           f"For more information please look at the logs.",
-                                          clean_output)
-        except Exception as e:
-            clean_output = StringCleaner.get_clean_string(str(e))
-            self._shell_helper.logger.error(f"Error Running Terraform {command} {clean_output}")
-            raise TerraformExecutionError("Error during Terraform Plan. For more information please look at the logs.")
+                                          clean_output.getvalue())
 
-    def _write_to_exec_log(self, command: str, log_data: str, log_level: int) -> None:
-        clean_output = StringCleaner.get_clean_string(log_data)
-        self._exec_output_log.log(
-            log_level,
-            f"-------------------------------------------------=< {command} START "
-            f">=-------------------------------------------------\n"
-        )
-        self._exec_output_log.log(log_level, clean_output)
-        self._exec_output_log.log(
-            log_level,
-            f"-------------------------------------------------=< {command} END "
-            f">=---------------------------------------------------\n"
-        )
+        if write_to_log and command in ALLOWED_LOGGING_CMDS:
+            self._write_to_exec_log(command, clean_output.getvalue(), INFO_LOG_LEVEL)
+        return clean_output.getvalue() if decode else raw_output
+
+    def _get_tf_proc_env(self) -> Optional[dict]:
+        # built per command since cloud provider credentials are added to os.environ after init
+        if not self._use_plugin_cache_dir:
+            return None
+        return {**os.environ, TF_PLUGIN_CACHE_DIR_ENV_VAR: TERRAFORM_PLUGIN_CACHE_DIR}
+
+    def _write_to_exec_log(self, command: str, clean_output: str, log_level: int) -> None:
+        start_banner, end_banner = _EXEC_LOG_BANNERS[command]
+        self._exec_output_log.log(log_level, f"{start_banner}{clean_output}\n{end_banner}")
 
     def _set_service_status(self, status: str, description: str):
         self._shell_helper.live_status_updater.set_service_live_status(
@@ -6,5 +6,6 @@ TF_STATE_FILE_STRING = 'tf_state_file_string'
 BACKEND_ENV_VARS = 'backend_env_vars'
 
 TERRAFORM_EXEC_FILE = "terraform.exe"
+TF_CACHE_TEST_VERSION = "1.0.0"
 TF_HELLO_FILE = "hello.tf"
 SHELL_NAME = "Generic Terraform Service"
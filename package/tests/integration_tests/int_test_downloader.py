@@ -1,13 +1,19 @@
 import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
+from unittest.mock import patch
+from urllib.request import urlopen
 
 from cloudshell.iac.terraform.downloaders.downloader import Downloader
+from cloudshell.iac.terraform.downloaders.tf_exec_downloader import TfExecDownloader
 from cloudshell.iac.terraform.services.live_status_updater import LiveStatusUpdater
 from cloudshell.iac.terraform.services.sandbox_messages import SandboxMessagesService
 from shells.generic_terraform_service.src.data_model import GenericTerraformService
 from cloudshell.iac.terraform.models.shell_helper import ShellHelperObject
 from tests.constants import GITHUB_TF_PUBLIC_HELLO_URL_FILE, GITHUB_TF_PUBLIC_HELLO_URL_FOLDER, TERRAFORM_EXEC_FILE, \
-    SHELL_NAME, TF_HELLO_FILE
+    SHELL_NAME, TF_HELLO_FILE, TF_CACHE_TEST_VERSION
 from tests.integration_tests.helper_objects.integration_context import IntegrationData
 from cloudshell.iac.terraform.tagging.tags import TagsManager
 from cloudshell.iac.terraform.services.svc_attribute_handler import ServiceAttrHandler
@@ -16,7 +22,9 @@ from cloudshell.iac.terraform.services.svc_attribute_handler import ServiceAttrH
 class TestTerraformDownloader(TestCase):
     def setUp(self) -> None:
         self.integration_data = IntegrationData()
+        self._driver_helper = self._create_driver_helper()
 
+    def _create_driver_helper(self) -> ShellHelperObject:
         service_resource = GenericTerraformService.create_from_context(self.integration_data.context)
 
         sandbox_messages = SandboxMessagesService(
@@ -36,7 +44,7 @@ class TestTerraformDownloader(TestCase):
 
         attr_handler = ServiceAttrHandler(service_resource)
 
-        self._driver_helper = ShellHelperObject(
+        return ShellHelperObject(
             self.integration_data.real_api,
             self.integration_data.context.reservation.reservation_id,
             service_resource,
@@ -48,23 +56,26 @@ class TestTerraformDownloader(TestCase):
         )
 
     def _test_download_terraform_module(self, url: str, branch: str):
-        self.integration_data.context.resource.attributes[
+        # each download uses its own driver helper (and service attributes) so downloads can run concurrently
+        driver_helper = self._create_driver_helper()
+        driver_helper.tf_service.attributes[
             f"{SHELL_NAME}.Github Terraform Module URL"] = url
-        self._driver_helper.tf_service.attributes[
-            f"{SHELL_NAME}.Github Terraform Module URL"] = url
-        self.integration_data.context.resource.attributes[
-            f"{SHELL_NAME}.Branch"] = branch
-        self._driver_helper.tf_service.attributes[
+        driver_helper.tf_service.attributes[
             f"{SHELL_NAME}.Branch"] = branch
 
-        downloader = Downloader(self._driver_helper)
+        downloader = Downloader(driver_helper)
         tf_workingdir = downloader.download_terraform_module()
         self.assertTrue(os.path.exists(os.path.join(tf_workingdir, TF_HELLO_FILE)))
 
     def test_public_and_private_hello_dl(self):
-        self._test_download_terraform_module(GITHUB_TF_PUBLIC_HELLO_URL_FILE, "")
-        self._test_download_terraform_module(os.environ.get("GITHUB_TF_PRIVATE_HELLO_URL"), "")
-        self._test_download_terraform_module(GITHUB_TF_PUBLIC_HELLO_URL_FOLDER, "")
+        urls = [
+            GITHUB_TF_PUBLIC_HELLO_URL_FILE,
+            os.environ.get("GITHUB_TF_PRIVATE_HELLO_URL"),
+            GITHUB_TF_PUBLIC_HELLO_URL_FOLDER
+        ]
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            # consume the results so assertion errors raised in the worker threads fail the test
+            list(executor.map(self._test_download_terraform_module, urls, [""] * len(urls)))
 
     def test_download_terraform_executable(self):
         downloader = Downloader(self._driver_helper)
@@ -73,3 +84,23 @@ class TestTerraformDownloader(TestCase):
 
         self.assertTrue(os.path.exists(os.path.join(tf_workingdir, TERRAFORM_EXEC_FILE)))
         self.assertTrue(os.access(os.path.join(tf_workingdir, TERRAFORM_EXEC_FILE), os.X_OK))
+
+    def test_download_terraform_executable_uses_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        first_workingdir = tempfile.mkdtemp()
+        second_workingdir = tempfile.mkdtemp()
+        for temp_dir in (cache_dir, first_workingdir, second_workingdir):
+            self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        with patch("cloudshell.iac.terraform.downloaders.tf_exec_downloader.TERRAFORM_EXEC_CACHE_DIR", cache_dir):
+            with patch("cloudshell.iac.terraform.downloaders.tf_exec_downloader.urlopen",
+                       wraps=urlopen) as urlopen_mock:
+                TfExecDownloader.download_terraform_executable(first_workingdir, TF_CACHE_TEST_VERSION)
+            urlopen_mock.assert_called_once()
+
+            with patch("cloudshell.iac.terraform.downloaders.tf_exec_downloader.urlopen") as urlopen_mock:
+                TfExecDownloader.download_terraform_executable(second_workingdir, TF_CACHE_TEST_VERSION)
+            urlopen_mock.assert_not_called()
+
+        self.assertTrue(os.access(os.path.join(first_workingdir, TERRAFORM_EXEC_FILE), os.X_OK))
+        self.assertTrue(os.access(os.path.join(second_workingdir, TERRAFORM_EXEC_FILE), os.X_OK))
@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.api.cloudshell_api import SandboxDataKeyValue
+
+from cloudshell.iac.terraform.constants import TF_WORKING_DIR, TF_TEMP_ROOT
+from cloudshell.iac.terraform.services.local_dir_service import LocalDir
+from cloudshell.iac.terraform.services.sandox_data import SandboxDataHandler
+
+
+class TestLocalDir(TestCase):
+
+    def setUp(self) -> None:
+        # mimic the structure created by the downloader: <temp root>/repo.zip and <temp root>/REPO/<path in repo>
+        self.tf_temp_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tf_temp_root, ignore_errors=True)
+        self.tf_working_dir = os.path.join(self.tf_temp_root, "REPO", "modules", "hello")
+        os.makedirs(self.tf_working_dir)
+        open(os.path.join(self.tf_temp_root, "repo.zip"), "w").close()
+
+    def test_delete_local_temp_dir_uses_recorded_temp_root(self):
+        # arrange
+        sandbox_data_handler = TestHelper.create_sandbox_data_handler(
+            {TF_WORKING_DIR: self.tf_working_dir, TF_TEMP_ROOT: self.tf_temp_root}
+        )
+        api = sandbox_data_handler._driver_helper_obj.api
+
+        # act
+        LocalDir.delete_local_temp_dir(sandbox_data_handler, self.tf_working_dir)
+
+        # assert
+        self.assertFalse(os.path.exists(self.tf_temp_root))
+        api.GetSandboxData.assert_called_once()
+        api.SetSandboxData.assert_called_once()
+        saved_data = json.loads(api.SetSandboxData.call_args[0][1][0].Value)
+        self.assertEqual(saved_data, {TF_WORKING_DIR: "", TF_TEMP_ROOT: ""})
+
+    def test_delete_local_temp_dir_ignores_stale_temp_root(self):
+        # arrange
+        stale_temp_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, stale_temp_root, ignore_errors=True)
+        sandbox_data_handler = TestHelper.create_sandbox_data_handler(
+            {TF_WORKING_DIR: self.tf_working_dir, TF_TEMP_ROOT: stale_temp_root}
+        )
+
+        # act
+        LocalDir.delete_local_temp_dir(sandbox_data_handler, self.tf_working_dir)
+
+        # assert
+        self.assertFalse(os.path.exists(self.tf_temp_root))
+        self.assertTrue(os.path.exists(stale_temp_root))
+
+    def test_set_tf_working_dir_clears_temp_root_when_not_provided(self):
+        # arrange
+        sandbox_data_handler = TestHelper.create_sandbox_data_handler(
+            {TF_WORKING_DIR: self.tf_working_dir, TF_TEMP_ROOT: self.tf_temp_root}
+        )
+        api = sandbox_data_handler._driver_helper_obj.api
+
+        # act
+        sandbox_data_handler.set_tf_working_dir("/user/provided/dir")
+
+        # assert
+        saved_data = json.loads(api.SetSandboxData.call_args[0][1][0].Value)
+        self.assertEqual(saved_data, {TF_WORKING_DIR: "/user/provided/dir", TF_TEMP_ROOT: ""})
+
+    def test_delete_local_temp_dir_finds_temp_root_when_not_recorded(self):
+        # arrange
+        sandbox_data_handler = TestHelper.create_sandbox_data_handler({TF_WORKING_DIR: self.tf_working_dir})
+        open(os.path.join(self.tf_working_dir, "main.tf"), "w").close()
+
+        # act
+        LocalDir.delete_local_temp_dir(sandbox_data_handler, self.tf_working_dir)
+
+        # assert
+        self.assertFalse(os.path.exists(self.tf_temp_root))
+
+    def test_delete_local_temp_dir_raises_when_temp_root_not_found(self):
+        # arrange
+        sandbox_data_handler = TestHelper.create_sandbox_data_handler({TF_WORKING_DIR: self.tf_working_dir})
+        os.remove(os.path.join(self.tf_temp_root, "repo.zip"))
+
+        # act & assert
+        with self.assertRaises(ValueError):
+            LocalDir.delete_local_temp_dir(sandbox_data_handler, self.tf_working_dir)
+        self.assertTrue(os.path.exists(self.tf_working_dir))
+
+
+class TestHelper:
+    @staticmethod
+    def create_sandbox_data_handler(uuid_data: dict) -> SandboxDataHandler:
+        driver_helper = Mock()
+        driver_helper.attr_handler.get_attribute.return_value = "uuid"
+        driver_helper.api.GetSandboxData.return_value.SandboxDataKeyValues = [
+            SandboxDataKeyValue("uuid", json.dumps(uuid_data))
+        ]
+        sandbox_data_handler = SandboxDataHandler(driver_helper)
+        driver_helper.api.reset_mock()
+        return sandbox_data_handler
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from cloudshell.iac.terraform.services.string_cleaner import StringCleaner
+
+
+class TestStringCleaner(TestCase):
+
+    def test_get_clean_string_removes_ansi_escapes(self):
+        # act
+        result = StringCleaner.get_clean_string("\x1b[1m\x1b[32mApply complete!\x1b[0m Resources: 1 added")
+
+        # assert
+        self.assertEqual(result, "Apply complete! Resources: 1 added")
+
+    def test_get_clean_string_without_ansi_escapes(self):
+        # act
+        result = StringCleaner.get_clean_string("Plan: 1 to add, 0 to change, 0 to destroy.\n")
+
+        # assert
+        self.assertEqual(result, "Plan: 1 to add, 0 to change, 0 to destroy.\n")
+
+    def test_get_clean_string_removes_non_cp1252_chars(self):
+        # act
+        result = StringCleaner.get_clean_string("Outputs: │ value")
+
+        # assert
+        self.assertEqual(result, "Outputs:  value")
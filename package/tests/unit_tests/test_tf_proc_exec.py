@@ -0,0 +1,260 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import TestCase
+from unittest.mock import Mock, MagicMock, patch
+
+from cloudshell.iac.terraform.constants import PLAN, OUTPUT, APPLY, INIT
+from cloudshell.iac.terraform.models.exceptions import TerraformExecutionError
+from cloudshell.iac.terraform.services.input_output_service import TFVar
+from cloudshell.iac.terraform.services.tf_proc_exec import TfProcExec
+
+
+class TestTfProcExec(TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch("cloudshell.iac.terraform.services.tf_proc_exec._create_logger")
+        self.create_logger_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.input_output_service = Mock()
+        self.input_output_service.get_all_terrafrom_variables.return_value = [TFVar("var1", "val1"),
+                                                                              TFVar("var2", "val2")]
+        sb_data_handler = Mock()
+        sb_data_handler.get_tf_working_dir.return_value = "tf_working_dir"
+        self.tf_proc_exec = TfProcExec(Mock(), sb_data_handler, Mock(), self.input_output_service)
+
+    def _create_temp_dir(self) -> str:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        return temp_dir
+
+    def test_exec_log_is_not_created_on_init(self):
+        # assert
+        self.create_logger_mock.assert_not_called()
+        self.assertTrue(self.tf_proc_exec.can_execute_run())
+        self.create_logger_mock.assert_not_called()
+
+    def test_init_is_skipped_when_inputs_did_not_change(self):
+        # arrange
+        self.tf_proc_exec._tf_working_dir = self._create_temp_dir()
+        os.mkdir(os.path.join(self.tf_proc_exec._tf_working_dir, ".terraform"))
+        self.tf_proc_exec._backend_handler.get_backend_secret_vars.return_value = {"key": "val"}
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+
+        # act
+        self.tf_proc_exec.init_terraform()
+        self.tf_proc_exec.init_terraform()
+
+        # assert
+        self.tf_proc_exec._run_tf_proc_with_command.assert_called_once()
+
+    def test_init_runs_again_when_backend_config_changed(self):
+        # arrange
+        self.tf_proc_exec._tf_working_dir = self._create_temp_dir()
+        os.mkdir(os.path.join(self.tf_proc_exec._tf_working_dir, ".terraform"))
+        self.tf_proc_exec._backend_handler.get_backend_secret_vars.side_effect = [{"key": "val1"}, {"key": "val2"}]
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+
+        # act
+        self.tf_proc_exec.init_terraform()
+        self.tf_proc_exec.init_terraform()
+
+        # assert
+        self.assertEqual(self.tf_proc_exec._run_tf_proc_with_command.call_count, 2)
+
+    def test_init_runs_when_init_hash_cannot_be_read(self):
+        # arrange
+        self.tf_proc_exec._tf_working_dir = self._create_temp_dir()
+        os.mkdir(os.path.join(self.tf_proc_exec._tf_working_dir, ".terraform"))
+        self.tf_proc_exec._backend_handler.get_backend_secret_vars.return_value = {"key": "val"}
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+        self.tf_proc_exec.init_terraform()
+
+        # act
+        with patch.object(self.tf_proc_exec, "_read_init_hash", side_effect=PermissionError("locked")):
+            self.tf_proc_exec.init_terraform()
+
+        # assert
+        self.assertEqual(self.tf_proc_exec._run_tf_proc_with_command.call_count, 2)
+        self.tf_proc_exec._sb_data_handler.set_status.assert_not_called()
+
+    def test_init_reads_tf_vars_for_later_commands(self):
+        # arrange
+        self.tf_proc_exec._tf_working_dir = self._create_temp_dir()
+        self.tf_proc_exec._backend_handler.get_backend_secret_vars.return_value = {}
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+
+        # act
+        self.tf_proc_exec.init_terraform()
+        self.tf_proc_exec.plan_terraform()
+
+        # assert
+        self.input_output_service.get_all_terrafrom_variables.assert_called_once()
+
+    def test_init_ignores_errors_reading_tf_vars(self):
+        # arrange
+        self.tf_proc_exec._tf_working_dir = self._create_temp_dir()
+        self.tf_proc_exec._backend_handler.get_backend_secret_vars.return_value = {}
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+        self.input_output_service.get_all_terrafrom_variables.side_effect = ValueError("missing attribute")
+
+        # act
+        self.tf_proc_exec.init_terraform()
+
+        # assert
+        self.tf_proc_exec._run_tf_proc_with_command.assert_called_once()
+        self.assertIn("missing attribute", self.tf_proc_exec._shell_helper.logger.warning.call_args[0][0])
+        with self.assertRaises(ValueError):
+            self.tf_proc_exec.plan_terraform()
+
+    def test_tf_vars_are_read_once_per_run(self):
+        # arrange
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+
+        # act
+        self.tf_proc_exec.plan_terraform()
+        self.tf_proc_exec.destroy_terraform()
+
+        # assert
+        self.input_output_service.get_all_terrafrom_variables.assert_called_once()
+
+    def test_plan_adds_tf_vars_to_command(self):
+        # arrange
+        self.tf_proc_exec._run_tf_proc_with_command = Mock()
+
+        # act
+        self.tf_proc_exec.plan_terraform()
+
+        # assert
+        cmd = self.tf_proc_exec._run_tf_proc_with_command.call_args[0][0]
+        self.assertEqual(cmd[-4:], ["-var", "var1=val1", "-var", "var2=val2"])
+
+    def test_save_terraform_outputs_parses_output_json(self):
+        # arrange
+        self.tf_proc_exec._run_tf_proc_with_command = Mock(
+            return_value=b'{"out1": {"sensitive": false, "type": "string", "value": "val1"}}'
+        )
+
+        # act
+        self.tf_proc_exec.save_terraform_outputs()
+
+        # assert
+        self.input_output_service.parse_and_save_outputs.assert_called_once_with(
+            {"out1": {"sensitive": False, "type": "string", "value": "val1"}}
+        )
+
+    def test_save_terraform_outputs_keeps_big_numbers(self):
+        # arrange
+        self.tf_proc_exec._run_tf_proc_with_command = Mock(
+            return_value=b'{"big": {"sensitive": false, "type": "number", "value": 123456789012345678901234567890},'
+                         b' "huge": {"sensitive": false, "type": "number", "value": 1e400}}'
+        )
+
+        # act
+        self.tf_proc_exec.save_terraform_outputs()
+
+        # assert
+        self.input_output_service.parse_and_save_outputs.assert_called_once_with(
+            {"big": {"sensitive": False, "type": "number", "value": 123456789012345678901234567890},
+             "huge": {"sensitive": False, "type": "number", "value": float("inf")}}
+        )
+
+    def test_save_terraform_outputs_keeps_big_negative_numbers(self):
+        # arrange
+        self.tf_proc_exec._run_tf_proc_with_command = Mock(
+            return_value=b'{"below_min": {"sensitive": false, "type": "number", "value": -9223372036854775809},'
+                         b' "negative": {"sensitive": false, "type": "number", "value": -9999999999999999999}}'
+        )
+
+        # act
+        self.tf_proc_exec.save_terraform_outputs()
+
+        # assert
+        self.input_output_service.parse_and_save_outputs.assert_called_once_with(
+            {"below_min": {"sensitive": False, "type": "number", "value": -9223372036854775809},
+             "negative": {"sensitive": False, "type": "number", "value": -9999999999999999999}}
+        )
+
+    @patch("cloudshell.iac.terraform.services.tf_proc_exec.Popen")
+    def test_run_tf_proc_returns_clean_output(self, popen_mock):
+        # arrange
+        TestHelper.mock_tf_proc(popen_mock, [b"\x1b[1mPlan:\x1b[0m 1 to add\n", b"done\n"], 0)
+
+        # act
+        result = self.tf_proc_exec._run_tf_proc_with_command(["plan"], PLAN)
+
+        # assert
+        self.assertEqual(result, "Plan: 1 to add\ndone\n")
+
+    @patch("cloudshell.iac.terraform.services.tf_proc_exec.Popen")
+    def test_run_tf_proc_returns_raw_output_without_decode(self, popen_mock):
+        # arrange
+        TestHelper.mock_tf_proc(popen_mock, [b'{"out": {"value": "what?"}}\n'], 0)
+
+        # act
+        result = self.tf_proc_exec._run_tf_proc_with_command(["output", "-json"], OUTPUT, write_to_log=False,
+                                                             decode=False)
+
+        # assert
+        self.assertEqual(result, b'{"out": {"value": "what?"}}\n')
+
+    @patch("cloudshell.iac.terraform.services.tf_proc_exec.Popen")
+    def test_run_tf_proc_raises_on_non_zero_exit_code(self, popen_mock):
+        # arrange
+        TestHelper.mock_tf_proc(popen_mock, [b"Error: bad input\n"], 1)
+
+        # act & assert
+        with self.assertRaises(TerraformExecutionError):
+            self.tf_proc_exec._run_tf_proc_with_command(["plan"], PLAN)
+
+    @patch("cloudshell.iac.terraform.services.tf_proc_exec.Popen")
+    def test_run_tf_proc_writes_exec_log_once(self, popen_mock):
+        # arrange
+        TestHelper.mock_tf_proc(popen_mock, [b"Apply complete!\n"], 0)
+
+        # act
+        self.tf_proc_exec._run_tf_proc_with_command(["apply"], APPLY)
+
+        # assert
+        self.create_logger_mock.assert_called_once()
+        self.tf_proc_exec._exec_output_log.log.assert_called_once()
+        self.assertIn("Apply complete!", self.tf_proc_exec._exec_output_log.log.call_args[0][1])
+
+    @patch("cloudshell.iac.terraform.services.tf_proc_exec.Popen")
+    def test_run_tf_proc_sets_plugin_cache_dir_when_enabled(self, popen_mock):
+        # arrange
+        TestHelper.mock_tf_proc(popen_mock, [b"Terraform has been successfully initialized!\n"], 0)
+        plugin_cache_dir = os.path.join(self._create_temp_dir(), "plugin-cache")
+
+        # act
+        with patch.dict(os.environ, clear=True), \
+                patch("cloudshell.iac.terraform.services.tf_proc_exec.TERRAFORM_PLUGIN_CACHE_DIR", plugin_cache_dir):
+            tf_proc_exec = TfProcExec(Mock(), self.tf_proc_exec._sb_data_handler, Mock(), self.input_output_service,
+                                      use_plugin_cache_dir=True)
+            tf_proc_exec._run_tf_proc_with_command(["init"], INIT)
+
+        # assert
+        self.assertTrue(os.path.isdir(plugin_cache_dir))
+        self.assertEqual(popen_mock.call_args[1]["env"]["TF_PLUGIN_CACHE_DIR"], plugin_cache_dir)
+
+    @patch("cloudshell.iac.terraform.services.tf_proc_exec.Popen")
+    def test_run_tf_proc_does_not_set_plugin_cache_dir_by_default(self, popen_mock):
+        # arrange
+        TestHelper.mock_tf_proc(popen_mock, [b"Terraform has been successfully initialized!\n"], 0)
+
+        # act
+        self.tf_proc_exec._run_tf_proc_with_command(["init"], INIT)
+
+        # assert
+        self.assertIsNone(popen_mock.call_args[1]["env"])
+
+
+class TestHelper:
+    @staticmethod
+    def mock_tf_proc(popen_mock: Mock, output_lines: list, return_code: int) -> None:
+        proc = MagicMock()
+        proc.stdout = BytesIO(b"".join(output_lines))
+        proc.wait.return_value = return_code
+        popen_mock.return_value.__enter__.return_value = proc
@@ -22,6 +22,7 @@ class TestMockTerraformExecuteDestroy(TestCase):
         patched_api.return_value.get_api.return_value = self.mock_api
 
         self._mocked_tf_working_dir = ''
+        self._mocked_tf_temp_root = ''
         self._prepare_mock_services()
 
         self.mock_api.GetReservationDetails.return_value.ReservationDescription.Services = [self._service1,
@@ -78,6 +79,7 @@ class TestMockTerraformExecuteDestroy(TestCase):
         mock_sbdata_handler = Mock()
         mock_sbdata_handler.get_tf_working_dir = self._get_mocked_tf_working_dir
         mock_sbdata_handler.set_tf_working_dir = self._set_mocked_tf_working_dir
+        mock_sbdata_handler.get_tf_temp_root = self._get_mocked_tf_temp_root
         patched_sbdata_handler.return_value = mock_sbdata_handler
         self.run_execute_and_destroy(
             pre_exec_function=self.pre_exec_azure_vault,
@@ -213,8 +215,12 @@ class TestMockTerraformExecuteDestroy(TestCase):
     def _get_mocked_tf_working_dir(self):
         return self._mocked_tf_working_dir
 
-    def _set_mocked_tf_working_dir(self, tf_working_dir: str):
+    def _set_mocked_tf_working_dir(self, tf_working_dir: str, tf_temp_root: str = "", uuid_data: dict = None):
         self._mocked_tf_working_dir = tf_working_dir
+        self._mocked_tf_temp_root = tf_temp_root
+
+    def _get_mocked_tf_temp_root(self, uuid_data: dict = None):
+        return self._mocked_tf_temp_root
 
 
 def _decrypt_password(x):